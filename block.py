@@ -20,6 +20,7 @@ to pick up.
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import math
+import numpy as np
 import pygame
 import pygame.math as pm
 from pygame.locals import (
@@ -30,9 +31,19 @@ from pygame.locals import (
     K_q,
     K_e
 )
+import block_physics
 import config as CONFIG
 import utilities
 
+# Bind frequently used config constants to module-level names so hot per-frame
+# code uses a single global load instead of a module-dict attribute lookup
+_PPI = CONFIG.ppi
+_DRAW_OFFSET = CONFIG.draw_offset
+
+# Manual-drive step sizes, fixed by the frame rate at import time
+_SPEED = 6 / CONFIG.frame_rate              # inch/s / frame/s
+_ROTATION_SPEED = 120 / CONFIG.frame_rate   # deg/s / frame/s
+
 class Block():
     '''This class represents the target block'''
 
@@ -40,7 +51,7 @@ class Block():
         '''Initialize the block class'''
 
         # Global position information (stored in inches/degrees)
-        self.position = pm.Vector2(CONFIG.block_position[0], CONFIG.block_position[1])
+        self.position = np.array(CONFIG.block_position, dtype=np.float64)
         self.rotation = CONFIG.block_rotation
 
         # Robot size (rectangular)
@@ -55,6 +66,10 @@ class Block():
             pm.Vector2( self.width/2, -self.height/2)
             ]
 
+        # Local outline as a (4, 2) array for vectorized rotation
+        self._outline_local = np.array([[point.x, point.y] for point in self.outline],
+                                       dtype=np.float64)
+
         self.outline_global = []
         self.outline_global_segments = []
         self.update_outline()
@@ -62,33 +77,35 @@ class Block():
         # Is the robot currently colliding with a maze wall?
         self.collision = False
 
-        # A trail of points where the block has moved
-        self.trail = [{
-            'position': self.position,
-            'rotation': self.rotation,
-            'collision': self.collision
-        }]
-
-        self.block_square = self._block_square_update()
+        # Preallocated pixel-space outline scratch buffer, refreshed only when
+        # the block has moved so a stationary block isn't re-transformed
+        self._pixel_outline = [[0.0, 0.0], [0.0, 0.0], [0.0, 0.0], [0.0, 0.0]]
+        self._cached_key = None
 
-
-    def _block_square_update(self):
-        '''Updates the line segments that form the block exterior for collision detection.'''
-        block_square = [[[self.outline_global[0][0], self.outline_global[0][1]], [self.outline_global[1][0], self.outline_global[1][1]]],
-                        [[self.outline_global[1][0], self.outline_global[1][1]], [self.outline_global[2][0], self.outline_global[2][1]]],
-                        [[self.outline_global[2][0], self.outline_global[2][1]], [self.outline_global[3][0], self.outline_global[3][1]]],
-                        [[self.outline_global[3][0], self.outline_global[3][1]], [self.outline_global[0][0], self.outline_global[0][1]]]]
-        return block_square
+        # A trail of points where the block has moved, stored as preallocated
+        # struct-of-arrays buffers that grow geometrically when full
+        self.trail_capacity = 256
+        self.trail_pos = np.empty((self.trail_capacity, 2), dtype=np.float32)
+        self.trail_rot = np.empty(self.trail_capacity, dtype=np.float32)
+        self.trail_col = np.empty(self.trail_capacity, dtype=bool)
+        self.trail_n = 0
+        self.append_trail()
 
     def append_trail(self):
         '''Appends current position information to the block's trail'''
         # Not used
 
-        self.trail.append({
-            'position': self.position,
-            'rotation': self.rotation,
-            'collision': self.collision
-        })
+        # Grow the trail buffers geometrically when they fill up
+        if self.trail_n >= self.trail_capacity:
+            self.trail_capacity *= 2
+            self.trail_pos = np.resize(self.trail_pos, (self.trail_capacity, 2))
+            self.trail_rot = np.resize(self.trail_rot, self.trail_capacity)
+            self.trail_col = np.resize(self.trail_col, self.trail_capacity)
+
+        self.trail_pos[self.trail_n] = self.position
+        self.trail_rot[self.trail_n] = self.rotation
+        self.trail_col[self.trail_n] = self.collision
+        self.trail_n += 1
 
     def update_outline(self):
         '''
@@ -96,55 +113,69 @@ class Block():
         to the center point of the block.
         '''
 
-        # Rotate the outline
-        outline_global = [point.rotate(self.rotation) for point in self.outline]
+        # Rotate the outline with a single matrix multiply and place it in the
+        # right location, instead of rotating each corner point individually
+        (c, s) = utilities.cos_sin(self.rotation)
+        rotation_matrix = np.array([[c, -s], [s, c]])
+        self.outline_global = self._outline_local @ rotation_matrix.T + self.position
 
-        # Place the outline in the right location
-        self.outline_global = [point + self.position for point in outline_global]
+        # Convert the outline points to line segments in one (4, 2, 2) array,
+        # pairing each vertex with the next without a Python loop
+        self.outline_global_segments = np.stack(
+            (self.outline_global, np.roll(self.outline_global, -1, axis=0)), axis=1)
 
-        # Convert the outline points to line segments
-        segments = []
-        for ct in range(-1, len(self.outline_global) - 1):
-            segments.append((self.outline_global[ct], self.outline_global[ct+1]))
+        # Flat (4, 4) endpoint view of the segments for the sensors' ray
+        # tests, so they don't reshape on every reading
+        self.outline_global_flat = self.outline_global_segments.reshape(-1, 4)
 
-        # Update the outline vertices and collision line segments
-        self.outline_global_segments = segments
-        self.block_square = self._block_square_update()
+        # Update the axis-aligned bounding box of the block for broad-phase collision checks
+        xs = [point[0] for point in self.outline_global]
+        ys = [point[1] for point in self.outline_global]
+        self.aabb = (min(xs), min(ys), max(xs), max(ys))
 
     def draw(self, canvas):
         '''Draws the block outline on the canvas'''
 
         # Graphics
-        THICKNESS = int(CONFIG.block_thickness * CONFIG.ppi)
+        THICKNESS = int(CONFIG.block_thickness * _PPI)
         COLOR = CONFIG.block_color
 
-        # Convert the outline from inches to pixels
-        outline = [point * CONFIG.ppi + [CONFIG.border_pixels, CONFIG.border_pixels]
-                   for point in self.outline_global]
+        # Convert the outline from inches to pixels in one broadcast operation,
+        # writing into the preallocated scratch buffer, and only when the
+        # block has moved since the last draw
+        key = (self.position[0], self.position[1], self.rotation)
+        if key != self._cached_key:
+            pixels = self.outline_global * _PPI + _DRAW_OFFSET
+            for ct in range(4):
+                self._pixel_outline[ct][0] = pixels[ct, 0]
+                self._pixel_outline[ct][1] = pixels[ct, 1]
+            self._cached_key = key
 
         # Draw the polygon
-        pygame.draw.polygon(canvas, COLOR, outline, THICKNESS)
+        pygame.draw.polygon(canvas, COLOR, self._pixel_outline, THICKNESS)
 
-    def move_manual(self, keypress, walls):
+    def move_manual(self, keypress, walls, walls_aabb=None, wall_grid=None,
+                    wall_segments=None):
         '''Determine the direction to move & rotate the block based on keypresses.'''
         # Not used
 
-        move_vector = pm.Vector2(0, 0)
+        move_x = 0.0
+        move_y = 0.0
         rotation = 0
-        speed = 6 / CONFIG.frame_rate               # inch/s / frame/s
-        rotation_speed = 120 / CONFIG.frame_rate    # deg/s / frame/s
+        speed = _SPEED
+        rotation_speed = _ROTATION_SPEED
 
         # Forward/backward movement
         if keypress[K_w]:
-            move_vector += [0, speed]
+            move_y += speed
         if keypress[K_s]:
-            move_vector += [0, -speed]
+            move_y -= speed
 
         # Left/right movement
         if keypress[K_q]:
-            move_vector += [speed, 0]
+            move_x += speed
         if keypress[K_e]:
-            move_vector += [-speed, 0]
+            move_x -= speed
 
         # Rotation
         if keypress[K_d]:
@@ -152,36 +183,120 @@ class Block():
         if keypress[K_a]:
             rotation += -rotation_speed
 
-        # Move the robot
-        self.move(move_vector, rotation, walls)
+        # Move the robot, unless no movement keys are pressed
+        if move_x or move_y or rotation:
+            self.move((move_x, move_y), rotation, walls, walls_aabb, wall_grid,
+                      wall_segments)
 
-    def move(self, velocity, rotation, walls):
+    def move(self, velocity, rotation, walls, walls_aabb=None, wall_grid=None,
+             wall_segments=None):
         '''Moves the robot, checking for collisions.'''
         # Not used
 
+        # Skip the outline update and wall scan entirely when not moving
+        if velocity[0] == 0 and velocity[1] == 0 and rotation == 0:
+            return
+
+        # When the flattened wall segment array is available and numba is
+        # installed, run the whole step through the compiled physics kernel:
+        # the outline is only rebuilt when the move actually succeeds
+        if wall_segments is not None and utilities.NUMBA_AVAILABLE:
+            (new_x, new_y, new_rot, collided) = block_physics.step(
+                self.position[0], self.position[1], self.rotation,
+                velocity[0], velocity[1], rotation,
+                self._outline_local, wall_segments[0])
+            if not collided:
+                self.position[0] = new_x
+                self.position[1] = new_y
+                self.rotation = new_rot
+                self.update_outline()
+            return
+
+        # Save the pre-move state so a collision rollback is a straight restore
+        # (update_outline rebinds new arrays, so only the position needs a copy)
+        prev_position = self.position.copy()
+        prev_rotation = self.rotation
+        prev_outline = self.outline_global
+        prev_segments = self.outline_global_segments
+        prev_flat = self.outline_global_flat
+        prev_aabb = self.aabb
+
         # Update robot position
-        self.position += pm.Vector2.rotate(velocity, self.rotation)
+        self.position += utilities.rotate_vector(velocity[0], velocity[1], self.rotation)
         self.rotation += rotation
         self.update_outline()
 
         # Reset the position if a collision is detected
-        collisions = self.check_collision_walls(walls)
+        collisions = self.check_collision_walls(walls, walls_aabb, wall_grid)
         if collisions:
-            self.position -= pm.Vector2.rotate(velocity, self.rotation)
-            self.rotation -= rotation
-            self.update_outline()
-
-    def check_collision_walls(self, walls: list):
+            self.position = prev_position
+            self.rotation = prev_rotation
+            self.outline_global = prev_outline
+            self.outline_global_segments = prev_segments
+            self.outline_global_flat = prev_flat
+            self.aabb = prev_aabb
+
+    def check_collision_walls(self, walls: list, walls_aabb: list = None, wall_grid=None,
+                              wall_segments=None):
         '''
         Checks for a collision between the robot's perimeter segments
-        and a set of wall line segments.
+        and a set of wall line segments. Wall squares whose axis-aligned
+        bounding boxes don't overlap the block's are skipped without testing
+        their individual segments. If a WallGrid is provided, only wall
+        squares in grid cells near the block are visited at all. If the maze's
+        flattened (segment array, square id) pair is provided as well, the
+        candidate segments are gathered with array indexing instead of Python
+        list building.
         '''
         # Not used
 
-        # Loop through all the robot outline line segments, checking for collisions
-        for segment_bot in self.outline_global_segments:
-            for square in walls:
-                for segment_wall in square:
-                    collision_points = utilities.collision(segment_bot, segment_wall)
-                    if collision_points:
-                        return collision_points
+        # Fully vectorized path using the maze's contiguous segment array
+        if wall_segments is not None and wall_grid is not None:
+            (segments_array, square_ids) = wall_segments
+            candidates = wall_grid.query(self.aabb)
+            if not candidates:
+                return None
+            mask = np.isin(square_ids, np.fromiter(candidates, dtype=np.int32,
+                                                   count=len(candidates)))
+            segments_wall = segments_array[mask].reshape(-1, 2, 2)
+
+            hits = utilities.collision_batch(self.outline_global_segments, segments_wall)
+            for (ct_bot, ct_wall) in zip(*np.nonzero(hits)):
+                collision_points = utilities.collision(
+                    self.outline_global_segments[ct_bot], segments_wall[ct_wall])
+                if collision_points:
+                    return collision_points
+            return None
+
+        # Compute the wall bounding boxes if a precomputed list isn't provided
+        if walls_aabb is None:
+            walls_aabb = utilities.wall_squares_aabb(walls)
+
+        (min_x, min_y, max_x, max_y) = self.aabb
+
+        # Use the spatial hash grid to narrow the walls to check, if available
+        if wall_grid is not None:
+            candidates = wall_grid.query(self.aabb)
+            walls_to_check = [(walls[i], walls_aabb[i]) for i in candidates]
+        else:
+            walls_to_check = zip(walls, walls_aabb)
+
+        # Gather the wall segments of squares whose bounding boxes overlap the block
+        segments_wall = []
+        for (square, square_aabb) in walls_to_check:
+            if (max_x < square_aabb[0] or min_x > square_aabb[2] or
+                max_y < square_aabb[1] or min_y > square_aabb[3]):
+                continue
+            segments_wall.extend(square)
+
+        if not segments_wall:
+            return None
+
+        # Batch-test all block edges against all candidate wall segments at once,
+        # then confirm the flagged pairs to get the exact collision points
+        hits = utilities.collision_batch(self.outline_global_segments, segments_wall)
+        for (ct_bot, ct_wall) in zip(*np.nonzero(hits)):
+            collision_points = utilities.collision(
+                self.outline_global_segments[ct_bot], segments_wall[ct_wall])
+            if collision_points:
+                return collision_points
@@ -18,6 +18,7 @@ This file stores the configuration information for the simulator.
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import numpy as np
 import pygame.math as pm
 from devices.motors import MotorSimple
 from devices.ultrasonic import Ultrasonic
@@ -59,6 +60,8 @@ robot_outline = [               # Robot outline, relative to center position
                 pm.Vector2( robot_width/2,  robot_width/2),
                 pm.Vector2( robot_width/2, -robot_width/2)
                 ]
+robot_outline_np = np.array([[point.x, point.y] for point in robot_outline],
+                            dtype=np.float64)   # Robot outline as an array for vectorized math
 
 # Maze definition information
 wall_segment_length = 12    # Length of maze wall segments (inches)
@@ -76,6 +79,7 @@ maze_dim_y = len(walls)*wall_segment_length
 frame_rate = 60             # Target frame rate (Hz)
 ppi = 12                    # Number of on-screen pixels per inch on display
 border_pixels = floor_segment_length * ppi  # Size of the border surrounding the maze area
+draw_offset = np.array([border_pixels, border_pixels], dtype=np.float64)  # Inches-to-pixels drawing offset
 
 background_color = (43, 122, 120)
 
@@ -250,6 +254,16 @@ sensors = {
     'i0': Infrared(i0_info)
 }
 
+# Flat list registries with string-to-index maps. The dicts above remain the
+# human-readable lookup for command dispatch; per-frame loops should iterate
+# the lists to avoid dict overhead.
+motors_list = list(motors.values())
+motor_idx = {d_id: ct for (ct, d_id) in enumerate(motors)}
+drives_list = list(drives.values())
+drive_idx = {d_id: ct for (ct, d_id) in enumerate(drives)}
+sensors_list = list(sensors.values())
+sensor_idx = {d_id: ct for (ct, d_id) in enumerate(sensors)}
+
 
 
 ### TESTING AND DEBUG SETTINGS ###
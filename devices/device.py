@@ -18,8 +18,10 @@ Defines the SimMeR device super class.
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import numpy as np
 import pygame
 import config as CONFIG
+import utilities
 
 class Device():
     '''The base class of all devices that are attached to a robot'''
@@ -41,15 +43,23 @@ class Device():
         self.rotation = rotation
         self.point_vector = pygame.math.Vector2(0, 1).rotate(rotation)
 
-        # Robot perimeter outline placeholder
+        # Robot perimeter outline placeholder. The local outline is converted
+        # to an array lazily since subclasses assign their outlines after this
+        # initializer runs.
         self.outline = []
+        self._outline_local = None
 
         # Absolute position, rotation, and outline points
-        self.position_global = [0, 0]
+        self.position_global = (0.0, 0.0)
         self.rotation_global = 0
         self.pos_update(CONFIG.robot_start_position, CONFIG.robot_start_rotation)
         self.outline_global = []
 
+        # Cached pixel-space outline, refreshed only when the device has
+        # moved so stationary devices aren't re-transformed every frame
+        self._pixel_outline = None
+        self._cached_key = None
+
         # Default display properties
         self.color = (0, 0, 0)
         self.outline_thickness = 0.2
@@ -58,31 +68,49 @@ class Device():
         self.visible_measurement = False
 
 
-    def pos_update(self, bot_pos: pygame.math.Vector2, bot_rot: float):
+    def pos_update(self, bot_pos, bot_rot: float):
         '''
         Updates the absolute position of the device based on its
         relative position and the position of the robot
         '''
-        self.position_global = bot_pos + pygame.math.Vector2.rotate(self.position, bot_rot)
+
+        # Inline the 2x2 rotation instead of going through Vector2.rotate,
+        # which allocates a new Vector2 per device per tick. The global
+        # position is stored as a plain (x, y) tuple for the same reason.
+        (c, s) = utilities.cos_sin(bot_rot)
+        (x, y) = (self.position.x, self.position.y)
+        self.position_global = (bot_pos[0] + x * c - y * s,
+                                bot_pos[1] + x * s + y * c)
         self.rotation_global = bot_rot + self.rotation
 
 
     def update_outline(self):
         '''Define the outline of the device, in inches, in the global reference frame.'''
 
-        # Rotate the outline
-        outline_global = [point.rotate(self.rotation_global) for point in self.outline]
+        # Convert the outline points to an array on first use
+        if self._outline_local is None:
+            self._outline_local = np.array([[point.x, point.y] for point in self.outline],
+                                           dtype=np.float64)
 
-        # Place the outline in the correct
-        self.outline_global = [point + self.position_global for point in outline_global]
+        # Rotate the outline with a single matrix multiply and place it in
+        # the correct location
+        (c, s) = utilities.cos_sin(self.rotation_global)
+        rotation_matrix = np.array([[c, -s], [s, c]])
+        self.outline_global = (self._outline_local @ rotation_matrix.T
+                               + self.position_global)
 
 
     def draw(self, canvas: object):
         '''Draws the device on the canvas'''
         THICKNESS = int(self.outline_thickness * CONFIG.ppi)
 
-        outline_global = [point * CONFIG.ppi + [CONFIG.border_pixels, CONFIG.border_pixels]
-                   for point in self.outline_global]
+        # Convert the outline from inches to pixels in one broadcast
+        # operation, but only when the device pose has changed since the
+        # conversion was last cached
+        key = (self.position_global, self.rotation_global)
+        if key != self._cached_key:
+            self._pixel_outline = self.outline_global * CONFIG.ppi + CONFIG.draw_offset
+            self._cached_key = key
 
         # Draw the polygon
-        pygame.draw.polygon(canvas, self.color, outline_global, THICKNESS)
+        pygame.draw.polygon(canvas, self.color, self._pixel_outline, THICKNESS)
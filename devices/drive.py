@@ -54,15 +54,24 @@ class Drive(Device):
         # ONLY ONE OF THESE TWO should be non-zero for each drive
         velocity = info.get('velocity', [0, 0])
         ang_velocity = info.get('ang_velocity', 0)
-        self.velocity = pm.Vector2(velocity[0] / CONFIG.frame_rate, # inch/frame
-                                   velocity[1] / CONFIG.frame_rate) # inch/frame
-        self.rotation_speed =      ang_velocity / CONFIG.frame_rate # deg/frame
 
-        # Get the unit vector of the velocity and angular velocity (the direction the robot will move)
-        if self.velocity != pm.Vector2(0, 0):
-            self.velocity_direction = self.velocity.normalize()
+        # Work out the magnitude and unit direction in scalar math first,
+        # then build the Vector2 attributes from the results, rather than
+        # constructing vectors just to compare and normalize them
+        vx = velocity[0] / CONFIG.frame_rate        # inch/frame
+        vy = velocity[1] / CONFIG.frame_rate        # inch/frame
+        self._vlen = math.hypot(vx, vy)
+        if self._vlen:
+            inv_vlen = 1.0 / self._vlen
+            self._vdir = (vx * inv_vlen, vy * inv_vlen)
         else:
-            self.velocity_direction = self.velocity
+            self._vdir = (0.0, 0.0)
+
+        self.velocity = pm.Vector2(vx, vy)
+        self.rotation_speed = ang_velocity / CONFIG.frame_rate # deg/frame
+
+        # Get the unit vector of the velocity and angular velocity (the direction the robot will move)
+        self.velocity_direction = pm.Vector2(self._vdir)
 
         if self.rotation_speed != 0:
             self.rotation_normalize = self.rotation_speed/self.rotation_speed
@@ -76,8 +85,11 @@ class Drive(Device):
         # For linear movement, drive units are inches, for rotational movement, units are degrees
         self.motor_direction = info['motor_direction']
 
-        # Get the odometer multipliers
+        # Get the odometer multipliers, and pair each motor with its
+        # multiplier once so the per-frame odometer loop doesn't rebuild
+        # the pairing
         self.odometer_multiplier = self._get_odometer_multiplier(info['motors'], info['motor_direction'])
+        self._motor_increments = list(zip(self.motors, self.odometer_multiplier))
 
         # Error and bias
         default = {'x':0, 'y':0, 'rotation':0}
@@ -90,6 +102,14 @@ class Drive(Device):
                               info.get('bias', default).get('y', 0)]
         self.bias_rotation =  info.get('bias', default).get('rotation', 0)
 
+        # Constants folded out of the per-frame move_update math: the step
+        # cap, the unit direction with its linear bias added, and the
+        # rotation flag with its rotational bias added
+        self._max_step = self.rotation_speed + self._vlen
+        self._dir_plus_bias = (self._vdir[0] + self.bias_linear[0],
+                               self._vdir[1] + self.bias_linear[1])
+        self._rot_plus_bias = (1.0 if self.rotation_speed else 0.0) + self.bias_rotation
+
         # Movement buffer (to split a movement command into multiple frames)
         self.move_buffer = 0
 
@@ -105,21 +125,25 @@ class Drive(Device):
         for (motor, direction) in zip(motors, motor_direction):
 
             # Calculate the multiplier for linear motion
-            if self.velocity.length():
-                # Increase due to off-angle wheel slippage
-                angle = math.radians(self.velocity_direction.angle_to(motor.point_vector))
-                slip_compensation = abs(math.cos(angle))
+            if self._vlen:
+                # Increase due to off-angle wheel slippage: the cosine of the
+                # angle between two vectors is their dot product over the
+                # product of their lengths, so there's no need to round-trip
+                # through angle_to and back into cos (point_vector is unit)
+                slip_compensation = abs(self._vdir[0] * motor.point_vector.x
+                                        + self._vdir[1] * motor.point_vector.y)
                 # DISTANCE_VALUE * mDir / slippage
                 multiplier = direction / slip_compensation
 
             # Calculate the multiplier for rotational motion
             elif self.rotation_speed:
-                ideal_rotation_direction = motor.position.rotate(90)
-                # Increase due to off-angle wheel slippage
-                angle = math.radians(ideal_rotation_direction.angle_to(motor.point_vector))
-                slip_compensation = abs(math.cos(angle))
+                # Ideal rotation direction is the motor position rotated 90
+                # degrees: (x, y) -> (-y, x)
+                radius = motor.position.length()
+                slip_compensation = abs(-motor.position.y * motor.point_vector.x
+                                        + motor.position.x * motor.point_vector.y) / radius
                 # DEG_VALUE/360 * 2*pi*r * mDir / slippage
-                multiplier = 1/360 * 2*math.pi*motor.position.length() * direction / slip_compensation
+                multiplier = 1/360 * 2*math.pi*radius * direction / slip_compensation
 
             # If neither present, set to 0
             else:
@@ -137,10 +161,11 @@ class Drive(Device):
         '''
         ROBOT = environment.get('ROBOT', False)
 
-        # Refuse the movement command if the robot is currently moving
-        for drive in ROBOT.drives.values():
-            if drive.move_buffer:
-                return False
+        # Refuse the movement command if the robot is currently moving. Only
+        # the drive that accepted the last command can have a non-empty
+        # buffer, so a single check replaces scanning every drive
+        if ROBOT.active_drive is not None and ROBOT.active_drive.move_buffer:
+            return False
 
         # Add errors
         error_total = 0
@@ -151,8 +176,9 @@ class Drive(Device):
         value_error = utilities.add_error(value, error_total)
         # print(value, value_error)
 
-        # Increment the movement buffer
+        # Increment the movement buffer and mark this drive as the active one
         self.move_buffer = value_error
+        ROBOT.active_drive = self
 
         # Return "inf" if the command is accepted and acknowledged
         return True
@@ -165,29 +191,22 @@ class Drive(Device):
         the movement buffer.
         '''
 
-        # Clamp the amount to move to smaller of the motor speed and the remaining movement buffer
-        # Add rotation and velocity because one should always be zero
-        if self.move_buffer >= 0:
-            move_amount = min(self.move_buffer, self.rotation_speed + self.velocity.length())
-        else:
-            move_amount = max(self.move_buffer, -(self.rotation_speed + self.velocity.length()))
+        # Clamp the amount to move to the smaller of the per-frame step cap
+        # and the remaining movement buffer, carrying the buffer's sign,
+        # without branching on the movement direction
+        move_amount = math.copysign(
+            min(abs(self.move_buffer), self._max_step), self.move_buffer)
 
         # Update the odometer value
-        for (motor, increment) in zip(self.motors, self.odometer_multiplier):
+        for (motor, increment) in self._motor_increments:
             motor.odometer += move_amount * increment
 
         # Decrement the movement buffer with the amount the drive moved
         self.move_buffer -= move_amount
 
-        # Calculate how much to move in each direction based on this drive
-        rotation = 0
-        move_vector = self.velocity_direction * move_amount
-        if self.rotation_speed:
-            rotation = move_amount
-
-        # Add bias and error to the drive
-        move_vector_error = [move_vector[0] + move_amount * self.bias_linear[0],
-                             move_vector[1] + move_amount * self.bias_linear[1]]
-        rotation_error =     rotation       + move_amount * self.bias_rotation
-
-        return [move_vector_error, rotation_error]
+        # Calculate how much to move in each direction based on this drive,
+        # with bias included: the direction and rotation terms were folded
+        # with their biases at init, so each axis is a single multiply
+        return [[self._dir_plus_bias[0] * move_amount,
+                 self._dir_plus_bias[1] * move_amount],
+                self._rot_plus_bias * move_amount]
@@ -54,6 +54,11 @@ class Gyroscope(Device):
         self.error = info.get('error', 0.2)         # Error when updating the gyroscope value
         self.bias = info.get('bias', 0.1)           # Bias that the gyroscope drifts with (deg/s)
 
+        # Frame-rate reciprocal, cached so the per-frame update multiplies
+        # instead of dividing (a module-level constant would run during
+        # config's import of this module, before frame_rate is defined)
+        self._inv_frame_rate = 1.0 / CONFIG.frame_rate
+
 
     def simulate(self, value: float, environment: dict):
         '''Returns the odometer value.'''
@@ -66,6 +71,13 @@ class Gyroscope(Device):
         self.rotation_true[0] = self.rotation_true[1]
         self.rotation_true[1] = self.rotation_global
 
-        # Add Error and update the device, wrap from 0 - 360 degrees
-        change = self.rotation_true[1] - self.rotation_true[0] + self.bias/CONFIG.frame_rate
-        self.gyro = (self.gyro + utilities.add_error(change, self.error)) % 360
+        # Add Error and update the device, wrap from 0 - 360 degrees. The
+        # per-frame change is far below a full turn, so the value wraps at
+        # most once and two compares replace the float modulo
+        change = self.rotation_true[1] - self.rotation_true[0] + self.bias*self._inv_frame_rate
+        gyro = self.gyro + utilities.add_error(change, self.error)
+        if gyro >= 360.0:
+            gyro -= 360.0
+        elif gyro < 0.0:
+            gyro += 360.0
+        self.gyro = gyro
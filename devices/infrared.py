@@ -22,6 +22,7 @@ import math
 import pygame
 import pygame.math as pm
 import shapely as shp
+import shapely.affinity
 from devices.device import Device
 import config as CONFIG
 import utilities
@@ -64,11 +65,34 @@ class Infrared(Device):
         # Simulation parameters
         self.fov = info.get('fov', 60)              # Field of view angle
         self.view_r = self.height * math.cos(math.radians(self.fov/2))
-        self.view_circle = shp.Point(self.position_global[0], self.position_global[1]).buffer(self.view_r)
+
+        # Buffering a point tessellates a fresh ~64-segment circle polygon,
+        # which is the expensive part, so do it once at the origin and
+        # translate the template to the sensor position when simulating
+        self._view_circle_template = shp.Point(0, 0).buffer(self.view_r)
+        self._view_r_px = self.view_r * CONFIG.ppi
+        self._inv_area = 1.0 / (math.pi * self.view_r * self.view_r)
+        self._view_circle_key = None
+        self.view_circle = self._view_circle_at_position()
         self.threshold = info.get('threshold', 0.8)
 
         self.error_pct = info.get('error', 0.02)    # Percent error (0-1)
 
+    def _view_circle_at_position(self):
+        '''
+        Returns the view circle translated to the sensor's global position,
+        reusing both the tessellated circle template and, while the sensor
+        hasn't moved, the previously translated polygon.
+        '''
+
+        key = self.position_global
+        if key != self._view_circle_key:
+            self.view_circle = shp.affinity.translate(
+                self._view_circle_template, self.position_global[0], self.position_global[1])
+            self._view_circle_key = key
+
+        return self.view_circle
+
     def draw_measurement(self, canvas):
         '''Draw ultrasonic sensor rays on the canvas'''
 
@@ -78,11 +102,14 @@ class Infrared(Device):
             THICKNESS = int(CONFIG.ppi*0.125)
             COLOR = (255, 255, 0)
 
-            # Circle parameters
-            center = [value*CONFIG.ppi + CONFIG.border_pixels for value in self.position_global]
-            radius = self.view_r * CONFIG.ppi
+            # Circle parameters: the pixel radius is cached at init, and the
+            # center conversion is two scalar multiply-adds with the config
+            # constants read once
+            (ppi, border) = (CONFIG.ppi, CONFIG.border_pixels)
+            center = (self.position_global[0]*ppi + border,
+                      self.position_global[1]*ppi + border)
 
-            pygame.draw.circle(canvas, COLOR, center, radius, THICKNESS)
+            pygame.draw.circle(canvas, COLOR, center, self._view_r_px, THICKNESS)
 
             # Decrement the buffer
             self.visible_measurement_buffer -= 1
@@ -98,14 +125,13 @@ class Infrared(Device):
         # Simulate the performance
         MAZE = environment.get('MAZE', False)
 
-        self.view_circle = shp.Point(self.position_global[0], self.position_global[1]).buffer(self.view_r)
-        area = math.pi * self.view_r * self.view_r
+        self.view_circle = self._view_circle_at_position()
 
         floor = MAZE.floor_white_poly
 
         overlap = self.view_circle.intersection(floor)
 
-        intersect_percent = overlap.area/area
+        intersect_percent = overlap.area * self._inv_area
 
         intersect_error = utilities.add_error(intersect_percent, self.error_pct, [0,1])
 
@@ -19,6 +19,7 @@ Defines a SimMeR device representing an ultrasonic sensor.
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import math
+import numpy as np
 import pygame
 import pygame.math as pm
 from devices.device import Device
@@ -64,30 +65,62 @@ class Ultrasonic(Device):
         self.beamwidth = info.get('beamwidth', 15)              # Beamwidth of the ultrasonic sensor
         self.num_rays = info.get('num_rays', 7)                 # Number of rays to test
         self.min_range = info.get('min_range', 0)               # Minimum range in inches
-        self.max_range = info.get('min_range', 433)             # Maximum range in inches
+        self.max_range = info.get('max_range', 433)             # Maximum range in inches
         self.error_pct = info.get('error', 0.02)                # Percent error (0-1)
         self.reading_bounds = [self.min_range, self.max_range]  # Upper and lower bounds for sensor reading
 
-        self.rays = self._define_rays() # Define the initial rays, without detecting collisions
-        self.ray_lengths_squared = [self.max_range**2 for item in self.rays]   # The length of the rays
+        # Cached squared tangent of the half-beamwidth, so the block
+        # visibility check is a multiply-compare instead of an arctangent
+        self._tan_sq_half_beam = math.tan(math.radians(self.beamwidth/2))**2
+
+        # Precompute the local ray endpoints: the ray angles relative to the
+        # device never change, so only the device's global rotation needs to
+        # be applied each tick
+        angles = [((ct - (self.num_rays-1)/2) / self.num_rays) * self.beamwidth
+                  for ct in range(0, self.num_rays)]
+        self._ray_ends_local = np.array(
+            [utilities.rotate_vector(0, self.max_range, angle) for angle in angles],
+            dtype=np.float32)
+
+        # Cached global-frame rays, rebuilt only when the device pose changes
+        # so a stationary robot doesn't redo the trig every measurement
+        self._rays_cached = None
+        self._rays_key = None
+
+        # Define the initial rays, without detecting collisions
+        (ray_starts, ray_ends) = self._define_rays()
+        self.rays = [[start, end] for (start, end) in zip(ray_starts, ray_ends)]
+        self.ray_lengths_squared = np.full(self.num_rays, self.max_range**2, dtype=np.float64)
+
+        # Preallocated scratch for the shortened ray endpoints, reused every
+        # simulate call so the steady state doesn't churn the allocator
+        self._ray_work = np.empty((self.num_rays, 2), dtype=np.float32)
 
     def _define_rays(self):
-        '''Define the rays used to get the ultrasonic distance.'''
+        '''
+        Define the rays used to get the ultrasonic distance, rotating the
+        precomputed local endpoints by the device's global rotation in a
+        single matrix multiply. Returns (ray_starts, ray_ends) arrays of
+        shape (num_rays, 2). The arrays are cached against the device pose
+        and are never mutated downstream, so repeated calls while the robot
+        is stationary return the same buffers.
+        '''
 
-        rays = []
-        for ct in range(0, self.num_rays):
-            # Calculate the angle of each ray
-            angle_ray = ((ct - (self.num_rays-1)/2) / self.num_rays) * self.beamwidth
-            angle_ray_global = angle_ray + self.rotation_global
+        key = (self.position_global, self.rotation_global)
+        if key == self._rays_key:
+            return self._rays_cached
 
-            # Calculate the start and end points of each ray
-            direction = pygame.math.Vector2(0,self.max_range)
-            ray_end = pygame.math.Vector2.rotate(direction, angle_ray_global) + self.position_global
+        (c, s) = utilities.cos_sin(self.rotation_global)
+        rotation_matrix = np.array([[c, -s], [s, c]], dtype=np.float32)
+        position = np.array(self.position_global, dtype=np.float32)
 
-            # Append the calculated rays
-            rays.append([self.position_global, ray_end])
+        ray_ends = self._ray_ends_local @ rotation_matrix.T + position
+        ray_starts = np.broadcast_to(position, ray_ends.shape)
 
-        return rays
+        self._rays_cached = (ray_starts, ray_ends)
+        self._rays_key = key
+
+        return self._rays_cached
 
     def draw_measurement(self, canvas):
         '''Draw ultrasonic sensor rays on the canvas'''
@@ -99,10 +132,11 @@ class Ultrasonic(Device):
             thickness = int(CONFIG.ppi*0.125)
             color = (0, 0, 255)
 
-            # Draw the lines on the canvas
-            for ray in self.rays:
-                start = [point*CONFIG.ppi + CONFIG.border_pixels for point in ray[0]]
-                end = [point*CONFIG.ppi + CONFIG.border_pixels for point in ray[1]]
+            # Convert every ray endpoint from inches to pixels in one
+            # broadcast operation (tolist gives pygame the plain float
+            # pairs it expects), then draw the lines
+            rays_px = (np.asarray(self.rays) * CONFIG.ppi + CONFIG.border_pixels).tolist()
+            for (start, end) in rays_px:
                 pygame.draw.line(canvas, color, start, end, thickness)
             # Decrement the buffer
             self.visible_measurement_buffer -= 1
@@ -117,34 +151,45 @@ class Ultrasonic(Device):
         MAZE = environment.get("MAZE", False)
         BLOCK = environment.get('BLOCK', False)
 
-        rays = self._define_rays()
-        ray_lengths_squared = [self.max_range**2 for item in rays]
+        (ray_starts, ray_ends) = self._define_rays()
 
         # Update the measurement display buffer
         self.visible_measurement_buffer = int(self.visible_measurement_time * CONFIG.frame_rate)
 
-        # Check if the sensor is at a height where the block would be seen
-        if self._block_visible(BLOCK):
-            walls_to_check = BLOCK.block_square + MAZE.reduced_walls
-        else:
-            walls_to_check = MAZE.reduced_walls
-
-        for ct, ray in enumerate(rays):
-            for wall in walls_to_check:
-                collision_points = utilities.collision(ray, wall)
-                if not collision_points:
-                    pass
-                else:
-                    rays[ct][1], ray_lengths_squared[ct] = utilities.closest_fast(
-                        self.position_global, collision_points
-                    )
+        # Cull walls that can't be hit before doing any intersection math: a
+        # segment is only reachable if its midpoint lies within the sensor's
+        # maximum range plus the segment's half-length
+        position = np.array(self.position_global, dtype=np.float32)
+        distances = np.hypot(MAZE.reduced_walls_mid[:, 0] - position[0],
+                             MAZE.reduced_walls_mid[:, 1] - position[1])
+        in_range = distances < (self.max_range + MAZE.reduced_walls_halflen)
+
+        # Gather the segments to check as one (N, 4) endpoint array, including
+        # the block when the sensor is at a height where it would be seen
+        walls_to_check = MAZE.reduced_walls_array[in_range]
+        if BLOCK and self._block_visible(BLOCK):
+            walls_to_check = np.vstack(
+                (BLOCK.outline_global_flat, walls_to_check))
+
+        # Intersect all rays against all segments in one vectorized pass,
+        # keeping the closest hit (smallest parametric t) per ray
+        t_min = np.minimum(
+            utilities.ray_segment_tmin(ray_starts, ray_ends, walls_to_check), 1.0)
+
+        # Shorten each ray to its closest hit and get the squared hit
+        # distances, writing through the preallocated scratch buffers
+        # instead of allocating new arrays each call
+        np.subtract(ray_ends, ray_starts, out=self._ray_work)
+        self._ray_work *= t_min[:, np.newaxis]
+        self._ray_work += ray_starts
+        np.multiply(t_min, self.max_range, out=t_min)
+        np.multiply(t_min, t_min, out=self.ray_lengths_squared)
 
         # Update stored variables
-        self.rays = rays
-        self.ray_lengths_squared = ray_lengths_squared
+        self.rays = [[start, end] for (start, end) in zip(ray_starts, self._ray_work)]
 
         # Build the value to return
-        output = math.sqrt(min(self.ray_lengths_squared))
+        output = math.sqrt(self.ray_lengths_squared.min())
 
         return utilities.add_error(output, self.error_pct, self.reading_bounds)
 
@@ -152,16 +197,23 @@ class Ultrasonic(Device):
         '''Determines whether the block is visibile to an ultrasonic sensor based on its height.'''
 
         # Get some geometric parameters
-        view_angle_z = self.beamwidth/2
         h = self.height - BLOCK.height
-        vec = pm.Vector2(BLOCK.position.x - self.position_global.x, BLOCK.position.y - self.position_global.y)
-
-        # Calculate distance and angle to block
-        d = vec.magnitude()
-        th = math.atan(h/d) * 180/math.pi
+        dx = BLOCK.position[0] - self.position_global[0]
+        dy = BLOCK.position[1] - self.position_global[1]
+        d_squared = dx*dx + dy*dy
+
+        # Ignore a block entirely beyond the sensor's reach (allowing for the
+        # block's own extent), since no ray could hit it anyway
+        reach = self.max_range + BLOCK.width
+        if d_squared > reach*reach:
+            return False
 
-        # If angle to block is less than sensor view angle, it's visible
-        if th <= view_angle_z:
+        # A sensor at or below the block's height always sees it
+        if h <= 0:
             return True
-        else:
-            return False
+
+        # The block is visible when the elevation angle to its top is within
+        # the sensor's half-beamwidth; with both angles below 90 degrees the
+        # arctangent compare reduces to h <= d*tan(beamwidth/2), squared on
+        # both sides to skip the square root
+        return h*h <= d_squared * self._tan_sq_half_beam
@@ -21,7 +21,8 @@ Defines the TCP/IP communication functions of the simulator.
 import socket
 import time
 import math
-from threading import Thread
+import queue
+from threading import Thread, Lock
 import config as CONFIG
 
 class TCPServer:
@@ -30,17 +31,31 @@ class TCPServer:
     def __init__(self):
         '''Instantiation'''
 
-        self.buffer_rx = ''
+        # Received commands are handed from the listener thread to the main
+        # loop through a bounded queue, whose lock makes the handoff safe;
+        # one slot keeps the original "refuse data until the pending command
+        # is consumed" behavior
+        self.buffer_rx = queue.Queue(maxsize=1)
+
+        # The transmit buffer is written by the main loop and the listener
+        # thread and drained by the transmitter thread, so every access is
+        # serialized through this lock
         self.buffer_tx = []
+        self._tx_lock = Lock()
         self.loopback = False
 
-        # Socket definition
+        # Socket definition. SO_REUSEADDR lets the simulator rebind its ports
+        # immediately after a restart instead of failing while the previous
+        # run's connections sit in TIME_WAIT, and the larger backlog keeps a
+        # burst of one-connection-per-command clients from being refused
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.bind((CONFIG.host, CONFIG.port_rx))
-        self.sock.listen(5)
+        self.sock.listen(128)
         self.sock2 = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock2.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock2.bind((CONFIG.host, CONFIG.port_tx))
-        self.sock2.listen(5)
+        self.sock2.listen(128)
 
         # Threads
         self.listen_thread = Thread(target=self.cmd_listener)
@@ -57,17 +72,24 @@ class TCPServer:
     def cmd_listener(self):
         '''The main tcp receive loop'''
 
+        # Read the config constants used on every connection once
+        timeout = CONFIG.timeout
+        str_encoding = CONFIG.str_encoding
+
         # Listen for commands from the command algorithm
         while True:
             # Have the socket accept data
             client_socket, addr = self.sock.accept()
-            client_socket.settimeout(CONFIG.timeout)
+            client_socket.settimeout(timeout)
+            # Send small packets immediately instead of letting Nagle's
+            # algorithm hold them back waiting for more data
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             with client_socket:
                 try:
                     print(f"The robot's socket has been connected to by address: {addr}")
 
                     # Store the incoming data as a string
-                    data_raw = client_socket.recv(1024).decode(CONFIG.str_encoding)
+                    data_raw = client_socket.recv(1024).decode(str_encoding)
 
                     # Ensure that the received data includes a start and end marker
                     data = self.depacketize(data_raw)
@@ -77,18 +99,20 @@ class TCPServer:
                         client_socket.close()
                         continue
 
-                    # If the receive buffer is empty, act on it. Else dump the data.
-                    if not self.buffer_rx:
-                        self.buffer_rx = data
+                    # If the receive buffer has room, act on it. Else dump the data.
+                    try:
+                        self.buffer_rx.put_nowait(data)
                         print(f'The following data was received: {data!r}')
                         # If loopback enabled, respond with a copy of the data
                         if self.loopback:
-                            if not self.buffer_tx:
-                                self.buffer_tx = data
-                    else:
+                            with self._tx_lock:
+                                if not self.buffer_tx:
+                                    self.buffer_tx = data
+                    except queue.Full:
                         print(f'The following data was received but the receive buffer is full: {data!r}')
-                        if not self.buffer_tx:
-                            self.buffer_tx = math.nan
+                        with self._tx_lock:
+                            if not self.buffer_tx:
+                                self.buffer_tx = math.nan
                     client_socket.close()
 
                 except TimeoutError:
@@ -99,42 +123,57 @@ class TCPServer:
     def response_transmitter(self):
         '''The main tcp transmit loop'''
 
+        # Read the config constants used on every connection once
+        str_encoding = CONFIG.str_encoding
+        empty_poll_delay = 1.0 / CONFIG.frame_rate
+
         while True:
             # Send the response over the socket
             client_socket, _ = self.sock2.accept()
-            if self.buffer_tx:
-                try:
-                    packet = self.make_tx_packet()
-                    client_socket.send(packet.encode(CONFIG.str_encoding))
-                    self.buffer_tx = []
-                except OSError:
-                    print("OS Error raised, continuing.")
-                except TypeError:
-                    print("Invalid tx buffer, flushing.")
-                    self.buffer_tx = []
+            # Send small packets immediately instead of letting Nagle's
+            # algorithm hold them back waiting for more data
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sent = False
+            with self._tx_lock:
+                if self.buffer_tx:
+                    try:
+                        packet = self.make_tx_packet()
+                        client_socket.send(packet.encode(str_encoding))
+                        self.buffer_tx = []
+                        sent = True
+                    except OSError:
+                        print("OS Error raised, continuing.")
+                    except TypeError:
+                        print("Invalid tx buffer, flushing.")
+                        self.buffer_tx = []
             client_socket.close()
-            time.sleep(1/CONFIG.frame_rate)
+            # Throttle only the polls that found nothing to send, so a
+            # client asking for the next response isn't made to wait out a
+            # frame period after a successful transmission
+            if not sent:
+                time.sleep(empty_poll_delay)
 
     def make_tx_packet(self):
         '''
         Build the packet from the responses
         '''
-        packet = ''
+        round_digits = CONFIG.round_digits
+        parts = []
         for response in self.buffer_tx:
             cmd = response[0]
             value = response[1]
-            if isinstance(response[1], float):
-                value = round(value, CONFIG.round_digits)
-            packet = packet + (f'{cmd}:{value},')
-        return self.packetize(packet[:-1])
+            if isinstance(value, float):
+                value = round(value, round_digits)
+            parts.append(f'{cmd}:{value}')
+        return self.packetize(','.join(parts))
 
     def get_buffer_rx(self):
         '''Get and clear the receive buffer.'''
-        if self.buffer_rx:
-            data = self.buffer_rx
-            self.buffer_rx = ''
-            return self.parse_commands(data)
-        return []
+        try:
+            data = self.buffer_rx.get_nowait()
+        except queue.Empty:
+            return []
+        return self.parse_commands(data)
 
     def parse_commands(self, data: str):
         '''
@@ -159,8 +198,9 @@ class TCPServer:
         '''
         Put data into the transmit buffer.
         '''
-        for response in responses:
-            self.buffer_tx.append(response)
+        with self._tx_lock:
+            for response in responses:
+                self.buffer_tx.append(response)
 
     # Packetization and Depacketization functions
     def depacketize(self, data_raw: str):
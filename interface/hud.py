@@ -38,8 +38,13 @@ class Hud:
     def __init__(self):
         '''Initialize the robot class'''
 
-        # Indicator color (initial shade of gray)
-        self.indicator_color = 240
+        # Frame indicator fade cycle, precomputed as one RGB tuple per frame
+        # so the per-frame draw is a single list index instead of arithmetic
+        # plus tuple construction (initial shade of gray is 240)
+        step = max(1, int(240/CONFIG.frame_rate))
+        shades = list(range(240 - step, 0, -step)) + [240]
+        self.indicator_colors = [(shade, shade, shade) for shade in shades]
+        self.indicator_frame = len(self.indicator_colors) - 1
 
         # Create the indicator rectangle
         self.ind_pos = CONFIG.border_pixels/4
@@ -77,6 +82,12 @@ class Hud:
             K_e: pygame.Rect(self.ind_pos, self.key_ind_pos[K_e], self.ind_size, self.ind_size)
         }
 
+        # Flat (key, rect, pressed color) triples for the per-frame key
+        # indicator draw, so it doesn't rebuild dict items or redo the color
+        # lookups every frame
+        self.key_ind_draw = [(key, self.key_ind[key], self.key_ind_colors[key])
+                             for key in self.key_ind]
+
         # Clock for managing game framerate
         self.clock = pygame.time.Clock()
 
@@ -100,25 +111,20 @@ class Hud:
     def draw_frame_indicator(self, canvas):
         '''Draws the HUD frame indicator.'''
 
-        # Update the color value
-        self.indicator_color -= int(240/CONFIG.frame_rate)
-        if self.indicator_color <= 0:
-            self.indicator_color = 240
-
-        # Create an RGB color tuple
-        color_tuple = (self.indicator_color, self.indicator_color, self.indicator_color)
+        # Advance to the next precomputed shade, wrapping at the cycle end
+        self.indicator_frame += 1
+        if self.indicator_frame == len(self.indicator_colors):
+            self.indicator_frame = 0
 
         # Draw the indicator on the canvas
-        pygame.draw.rect(canvas, color_tuple, self.indicator)
+        pygame.draw.rect(canvas, self.indicator_colors[self.indicator_frame], self.indicator)
 
     def draw_keys(self, canvas, keypress):
         '''Draws indicators showing the currently pressed wasd-qe keys'''
 
-        for [key, value] in self.key_ind.items():
-            if keypress[key]:
-                pygame.draw.rect(canvas, self.key_ind_colors[key], self.key_ind[key])
-            else:
-                pygame.draw.rect(canvas, self.key_ind_colors['none'], self.key_ind[key])
+        off_color = self.key_ind_colors['none']
+        for (key, rect, on_color) in self.key_ind_draw:
+            pygame.draw.rect(canvas, on_color if keypress[key] else off_color, rect)
 
     def get_exec_time(self):
         '''Gets the frame calculation time'''
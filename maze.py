@@ -26,6 +26,42 @@ import config as CONFIG
 import utilities
 
 
+class WallGrid:
+    '''
+    A static uniform spatial hash grid over the maze wall squares. Each grid
+    cell is one wall segment length across and maps to the indices of the wall
+    squares that touch it, so collision queries only need to visit the wall
+    squares near the querying object instead of scanning the full wall list.
+    '''
+
+    def __init__(self, wall_squares: list, wall_squares_aabb: list):
+        '''Builds the grid from the wall squares and their bounding boxes.'''
+
+        self.cell_size = CONFIG.wall_segment_length
+        self.cells = {}
+
+        for (index, aabb) in enumerate(wall_squares_aabb):
+            for (ix, iy) in self._covered_cells(aabb):
+                self.cells.setdefault((ix, iy), []).append(index)
+
+    def _covered_cells(self, aabb):
+        '''Yields the (ix, iy) indices of all grid cells covered by a bounding box.'''
+
+        (min_x, min_y, max_x, max_y) = aabb
+        for ix in range(int(min_x // self.cell_size), int(max_x // self.cell_size) + 1):
+            for iy in range(int(min_y // self.cell_size), int(max_y // self.cell_size) + 1):
+                yield (ix, iy)
+
+    def query(self, aabb):
+        '''Returns the indices of all wall squares near a bounding box.'''
+
+        candidates = set()
+        for cell in self._covered_cells(aabb):
+            candidates.update(self.cells.get(cell, []))
+
+        return candidates
+
+
 class Maze:
     '''This class represents the maze/environment'''
     def __init__(self):
@@ -34,8 +70,15 @@ class Maze:
         self.size_x = 0
 
         self.wall_squares = []
+        self.wall_squares_aabb = []
+        self.wall_grid = None
+        self.wall_segments_array = np.empty((0, 4), dtype=np.float64)
+        self.wall_square_ids = np.empty(0, dtype=np.int32)
         self.walls = []
         self.reduced_walls = []
+        self.reduced_walls_array = np.empty((0, 4), dtype=np.float32)
+        self.reduced_walls_mid = np.empty((0, 2), dtype=np.float32)
+        self.reduced_walls_halflen = np.empty(0, dtype=np.float32)
         self.floor_tiles = []
         self.floor_tile_colors = 0
         self.floor_rect_black = []
@@ -80,6 +123,48 @@ class Maze:
         self.walls= [wall for wallsquare in self.wall_squares for wall in wallsquare]
         self.reduced_walls = utilities.optimize_walls(self.walls)
 
+        # Precompute the bounding box of each wall square for broad-phase collision checks
+        self.wall_squares_aabb = utilities.wall_squares_aabb(self.wall_squares)
+
+        # Build the static spatial hash grid over the wall squares
+        self.wall_grid = WallGrid(self.wall_squares, self.wall_squares_aabb)
+
+        # Flatten the reduced walls into one contiguous (N, 4) array of
+        # (x1, y1, x2, y2) rows for the vectorized sensor ray tests, along
+        # with each segment's midpoint and half-length for cheap range
+        # culling. float32 is plenty for inch-scale sensor geometry and
+        # halves the memory the ray kernel streams through every call.
+        self.reduced_walls_array = np.ascontiguousarray(
+            np.asarray(self.reduced_walls, dtype=np.float32).reshape(-1, 4))
+        self.reduced_walls_mid = 0.5 * (self.reduced_walls_array[:, 0:2]
+                                        + self.reduced_walls_array[:, 2:4])
+        self.reduced_walls_halflen = 0.5 * np.hypot(
+            self.reduced_walls_array[:, 2] - self.reduced_walls_array[:, 0],
+            self.reduced_walls_array[:, 3] - self.reduced_walls_array[:, 1])
+
+        # Flatten the wall segments into one contiguous (W, 4) array of
+        # (x1, y1, x2, y2) rows, with a parallel map of each segment to its
+        # parent square, for vectorized collision routines
+        (self.wall_segments_array, self.wall_square_ids) = self._build_wall_segments()
+
+    def _build_wall_segments(self):
+        '''
+        Flattens the wall squares into a contiguous segment-endpoint array of
+        shape (W, 4) plus an int array mapping each segment to its parent
+        square. Walls are static, so this only runs once at maze load.
+        '''
+
+        segments = []
+        square_ids = []
+        for (index, square) in enumerate(self.wall_squares):
+            for segment in square:
+                segments.append([segment[0][0], segment[0][1],
+                                 segment[1][0], segment[1][1]])
+                square_ids.append(index)
+
+        return (np.ascontiguousarray(segments, dtype=np.float64),
+                np.array(square_ids, dtype=np.int32))
+
     def draw_walls(self, canvas):
         '''Draws the maze walls onto the screen'''
 
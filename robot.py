@@ -19,6 +19,7 @@ Defines the SimMeR Robot class.
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import math
+import numpy as np
 import pygame
 import pygame.math as pm
 from pygame.locals import (
@@ -33,6 +34,10 @@ from pygame.locals import (
 import config as CONFIG
 import utilities
 
+# Manual-drive step sizes, fixed by the frame rate at import time
+_SPEED = 6 / CONFIG.frame_rate              # inch/s / frame/s
+_ROTATION_SPEED = 120 / CONFIG.frame_rate   # deg/s / frame/s
+
 class Robot():
     '''This class represents the robot'''
 
@@ -57,6 +62,10 @@ class Robot():
         # Is the robot currently colliding with a maze wall?
         self.collision = False
 
+        # Cached pixel-space outline, refreshed only when the robot has moved
+        self._pixel_outline = None
+        self._cached_key = None
+
         # A trail of points where the robot has moved
         self.trail = [{
             'position': self.position,
@@ -76,6 +85,18 @@ class Robot():
         # All devices
         self.devices = self.motors | self.drives | self.sensors
 
+        # The drive currently executing a movement command, if any. Commands
+        # are refused while a drive is moving, so at most one can be active;
+        # tracking it makes the busy check O(1) instead of a scan
+        self.active_drive = None
+
+        # Flat device lists for per-frame loops (the dicts are kept for
+        # command dispatch by ID string)
+        self.motors_list = list(self.motors.values())
+        self.drives_list = list(self.drives.values())
+        self.sensors_list = list(self.sensors.values())
+        self.devices_list = list(self.devices.values())
+
 
     def append_trail(self):
         '''Appends current position information to the robot's trail'''
@@ -92,18 +113,17 @@ class Robot():
         to the center point of the robot.
         '''
 
-        # Rotate the outline
-        outline_global = [point.rotate(self.rotation) for point in self.outline]
-
-        # Place the outline in the right location
-        self.outline_global = [point + self.position for point in outline_global]
-
-        # Convert the outline points to line segments
-        segments = []
-        for ct in range(-1, len(self.outline_global) - 1):
-            segments.append((self.outline_global[ct], self.outline_global[ct+1]))
+        # Rotate the outline with a single matrix multiply and place it in
+        # the right location, the same way the block and devices do
+        (c, s) = utilities.cos_sin(self.rotation)
+        rotation_matrix = np.array([[c, -s], [s, c]])
+        self.outline_global = (CONFIG.robot_outline_np @ rotation_matrix.T
+                               + [self.position.x, self.position.y])
 
-        self.outline_global_segments = segments
+        # Convert the outline points to line segments in one (4, 2, 2) array,
+        # pairing each vertex with the previous one
+        self.outline_global_segments = np.stack(
+            (np.roll(self.outline_global, 1, axis=0), self.outline_global), axis=1)
 
     def draw(self, canvas):
         '''Draws the robot outline on the canvas'''
@@ -112,18 +132,21 @@ class Robot():
         THICKNESS = int(CONFIG.robot_thickness * CONFIG.ppi)
         COLOR = CONFIG.robot_color
 
-        # Convert the outline from inches to pixels
-        outline = [point * CONFIG.ppi + [CONFIG.border_pixels, CONFIG.border_pixels]
-                   for point in self.outline_global]
+        # Convert the outline from inches to pixels in one broadcast
+        # operation, cached against the robot pose between draws
+        key = (self.position.x, self.position.y, self.rotation)
+        if key != self._cached_key:
+            self._pixel_outline = self.outline_global * CONFIG.ppi + CONFIG.draw_offset
+            self._cached_key = key
 
         # Draw the polygon
-        pygame.draw.polygon(canvas, COLOR, outline, THICKNESS)
+        pygame.draw.polygon(canvas, COLOR, self._pixel_outline, THICKNESS)
 
     def update_device_positions(self):
         '''
         Updates the global positions and outlines of all the robot's devices.
         '''
-        for device in self.devices.values():
+        for device in self.devices_list:
             device.pos_update(self.position, self.rotation)
             device.update_outline()
 
@@ -132,7 +155,7 @@ class Robot():
         Draws all devices on the robot onto the canvas unless marked otherwise.
         '''
 
-        for device in self.devices.values():
+        for device in self.devices_list:
             if device.visible:
                 device.draw(canvas)
                 if device.visible_measurement:
@@ -143,8 +166,8 @@ class Robot():
 
         move_vector = pm.Vector2(0, 0)
         rotation = 0
-        speed = 6 / CONFIG.frame_rate               # inch/s / frame/s
-        rotation_speed = 120 / CONFIG.frame_rate    # deg/s / frame/s
+        speed = _SPEED
+        rotation_speed = _ROTATION_SPEED
 
         # Forward/backward movement
         if keypress[K_w]:
@@ -178,7 +201,7 @@ class Robot():
 
         move_vector = pm.Vector2(0, 0)
         rotation = 0
-        for drive in self.drives.values():
+        for drive in self.drives_list:
             # Get the movement amount from the drive, incrementing odometers
             if drive.move_buffer == 0:
                 continue
@@ -233,7 +256,7 @@ class Robot():
 
     def stop_drives(self):
         '''Stops all drives from moving, used as an emergency stop.'''
-        for drive in self.drives.values():
+        for drive in self.drives_list:
             drive.move_buffer = 0
 
     def check_collision_walls(self, walls: list):
@@ -95,9 +95,9 @@ try:
 
         # Move the robot, either from keypress commands or from the movement buffers
         if True in keypress:
-            ROBOT.move_manual(keypress, [*BLOCK.block_square, *MAZE.reduced_walls])
+            ROBOT.move_manual(keypress, [*BLOCK.outline_global_segments, *MAZE.reduced_walls])
         else:
-            ROBOT.move_from_command([*BLOCK.block_square, *MAZE.reduced_walls])
+            ROBOT.move_from_command([*BLOCK.outline_global_segments, *MAZE.reduced_walls])
 
         # Recalculate global positions of the robot and its devices
         ROBOT.update_outline()
@@ -107,7 +107,7 @@ try:
         utilities.simulate_sensors(environment, SIMULATE_LIST)
 
         # Update the sensors that need to be updated every frame
-        for sensor in ROBOT.sensors.values():
+        for sensor in ROBOT.sensors_list:
             if callable(getattr(sensor, "update", None)):
                 sensor.update(environment)
 
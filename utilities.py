@@ -18,12 +18,28 @@ A collection of utility functions for SimMeR.
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
 import math
 import random
+import numpy as np
 import pygame
-import config as CONFIG
 from collections import Counter
 
+# Numba is an optional dependency: if it's available the scalar collision
+# kernels are JIT-compiled to machine code, otherwise they run as plain Python.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        '''No-op replacement for numba.njit when numba isn't installed.'''
+        if args and callable(args[0]):
+            return args[0]
+        def decorator(func):
+            return func
+        return decorator
+
 def add_error(value: float, pct_error: float, bounds: list = [],sigma=2):
     '''
     ADD_ERROR Adds normally distributed percent error to a measurement
@@ -36,119 +52,267 @@ def add_error(value: float, pct_error: float, bounds: list = [],sigma=2):
     will be limited to those within the given values
     '''
 
-    def clamp(number, bounds):
-        return max(min(bounds[1], number), bounds[0])
+    # Calculate the error value and add it to the original value. This runs
+    # once per sensor reading, so the branchless min/max clamp is done inline
+    # rather than through a nested helper function built on every call.
+    value_noisy = value + random.gauss(0, sigma) * pct_error * value
 
-    # Calculate the error value
-    error_value = random.gauss(0,sigma) * pct_error * value
-    # Add to the original value
-    value_noisy = value + error_value
     # Clamp it to the specified bounds
     if bounds:
-        return clamp(value_noisy, bounds)
-    else:
-        return value_noisy
+        return max(min(bounds[1], value_noisy), bounds[0])
+    return value_noisy
+
+
+@njit(cache=True)
+def _on_segment(px, py, qx, qy, rx, ry):
+    '''Calculates if a point q is on a line segment (p, r), assuming collinearity.'''
+    return (min(px, rx) <= qx <= max(px, rx)) and (min(py, ry) <= qy <= max(py, ry))
+
+
+@njit(cache=True)
+def _orientation(px, py, qx, qy, rx, ry):
+    '''
+    Finds the orientation of an ordered triplet (p,q,r).
+    Returns the following values:
+    0 : Collinear points, 1 : Clockwise points, 2 : Counterclockwise
+    '''
+    val = ((qy - py) * (rx - qx)) - ((qx - px) * (ry - qy))
+
+    if val > 0:     # Clockwise orientation
+        return 1
+    elif val < 0:   # Counterclockwise orientation
+        return 2
+    else:           # Collinear orientation
+        return 0
+
+
+@njit(cache=True)
+def _collision_kernel(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+    '''
+    Scalar segment-vs-segment intersection kernel operating on eight floats,
+    with no Python object allocation so it can be JIT-compiled. Returns the
+    number of intersection points (0-4) followed by their coordinates.
+    '''
+    # Some code from https://www.geeksforgeeks.org/check-if-two-given-line-segments-intersect/
+
+    # Find the 4 orientations required for general and special cases
+    o1 = _orientation(ax1, ay1, ax2, ay2, bx1, by1)
+    o2 = _orientation(ax1, ay1, ax2, ay2, bx2, by2)
+    o3 = _orientation(bx1, by1, bx2, by2, ax1, ay1)
+    o4 = _orientation(bx1, by1, bx2, by2, ax2, ay2)
+
+    points = np.zeros((4, 2))
+    count = 0
+
+    # General case: the segments cross, find the single crossing point
+    if (o1 != o2) and (o3 != o4):
+        dxa = ax1 - ax2
+        dxb = bx1 - bx2
+        dya = ay1 - ay2
+        dyb = by1 - by2
+        div = dxa * dyb - dya * dxb
+
+        if div != 0:
+            da = ax1 * ay2 - ay1 * ax2
+            db = bx1 * by2 - by1 * bx2
+            points[0, 0] = (da * dxb - dxa * db) / div
+            points[0, 1] = (da * dyb - dya * db) / div
+            count = 1
+
+        return (count, points)
+
+    # Colinear cases: collect every endpoint lying on the other segment
+    if (o1 == 0) and _on_segment(ax1, ay1, bx1, by1, ax2, ay2):
+        points[count, 0] = bx1
+        points[count, 1] = by1
+        count += 1
+    if (o2 == 0) and _on_segment(ax1, ay1, bx2, by2, ax2, ay2):
+        points[count, 0] = bx2
+        points[count, 1] = by2
+        count += 1
+    if (o3 == 0) and _on_segment(bx1, by1, ax1, ay1, bx2, by2):
+        points[count, 0] = ax1
+        points[count, 1] = ay1
+        count += 1
+    if (o4 == 0) and _on_segment(bx1, by1, ax2, ay2, bx2, by2):
+        points[count, 0] = ax2
+        points[count, 1] = ay2
+        count += 1
+
+    return (count, points)
 
 
 def collision(segment1: list, segment2: list):
     '''
     Checks for a collision between two line segments in format [[x1, y1], [x2, y2]],
-    returning intersect points in list or pygame.math.Vector2 format depending on
-    the formats of segment1 and segment2.
+    returning intersect points as a list of (x, y) tuples.
     0 collisions - [Empty List]
-    1 collision - [[x0, y0]]
-    2 collisions - [[x0, y0], [x1, y1]]
+    1 collision - [(x0, y0)]
+    2 collisions - [(x0, y0), (x1, y1)]
     '''
-    # Some code from https://www.geeksforgeeks.org/check-if-two-given-line-segments-intersect/
 
-    def on_segment(p, q, r):
-        # Calculates if a point q is on a line segment (p, r)
+    (count, points) = _collision_kernel(
+        segment1[0][0], segment1[0][1], segment1[1][0], segment1[1][1],
+        segment2[0][0], segment2[0][1], segment2[1][0], segment2[1][1])
 
-        if ((q[0] <= max(p[0], r[0])) and (q[0] >= min(p[0], r[0])) and
-            (q[1] <= max(p[1], r[1])) and (q[1] >= min(p[1], r[1]))):
-            return True
-        else:
-            return False
+    return [(points[ct, 0], points[ct, 1]) for ct in range(count)]
 
-    def orientation(p, q, r):
-        # Finds the orientation of an ordered triplet (p,q,r)
-        # Returns the following values:
-        # 0 : Collinear points, 1 : Clockwise points, 2 : Counterclockwise
 
-        val = (float(q[1] - p[1]) * (r[0] - q[0])) - (float(q[0] - p[0]) * (r[1] - q[1]))
+@functools.lru_cache(maxsize=8192)
+def _cos_sin_cached(deg_cent: int):
+    '''Computes (cos, sin) for an angle given in hundredths of a degree.'''
+    angle = math.radians(deg_cent / 100)
+    return (math.cos(angle), math.sin(angle))
 
-        if (val > 0):   # Clockwise orientation
-            return 1
-        elif (val < 0): # Counterclockwise orientation
-            return 2
-        else:           # Collinear orientation
-            return 0
 
-    def intersect(p1, q1, p2, q2):
-        # Returns true if the line segment (p1,q1) and (p2,q2) intersect.
-
-        # Find the 4 orientations required for general and special cases
-        o1 = orientation(p1, q1, p2)
-        o2 = orientation(p1, q1, q2)
-        o3 = orientation(p2, q2, p1)
-        o4 = orientation(p2, q2, q1)
-
-        # General case
-        if ((o1 != o2) and (o3 != o4)):
-            return (True, [])
-
-        collision_points = []
-
-        # Colinear cases
-        # p1 , q1 and p2 are collinear and p2 lies on segment p1q1
-        if ((o1 == 0) and on_segment(p1, p2, q1)):
-            collision_points.append(p2)
-        # p1 , q1 and q2 are collinear and q2 lies on segment p1q1
-        if ((o2 == 0) and on_segment(p1, q2, q1)):
-            collision_points.append(q2)
-        # p2 , q2 and p1 are collinear and p1 lies on segment p2q2
-        if ((o3 == 0) and on_segment(p2, p1, q2)):
-            collision_points.append(p1)
-        # p2 , q2 and q1 are collinear and q1 lies on segment p2q2
-        if ((o4 == 0) and on_segment(p2, q1, q2)):
-            collision_points.append(q1)
-
-        if collision_points:
-            return (True, collision_points)
-        else:
-            return (False, [])
+def cos_sin(degrees: float):
+    '''
+    Returns (cos, sin) of an angle in degrees, rounded to the nearest
+    hundredth of a degree. Rotation angles repeat from frame to frame (fixed
+    per-frame angular steps), so the cached values make repeated trig
+    evaluation essentially free.
+    '''
+    return _cos_sin_cached(round(degrees * 100))
+
+
+def rotate_vector(x: float, y: float, degrees: float):
+    '''
+    Rotates a 2D vector by an angle in degrees, returning an (x, y) tuple.
+    Matches the rotation convention of pygame.math.Vector2.rotate without
+    allocating Vector2 objects.
+    '''
 
-    def det(a, b):
-        # Determinant function for finding non-colinear intersection point
-        return (a[0] * b[1]) - (a[1] * b[0])
+    angle = math.radians(degrees)
+    (c, s) = (math.cos(angle), math.sin(angle))
+    return (x * c - y * s, x * s + y * c)
 
-    # Empty collision object
-    collisions = []
 
-    # Check whether segments intersect
-    intersections = intersect(*segment1, *segment2)
+def collision_batch(edges_a, edges_b):
+    '''
+    Vectorized segment intersection test between two batches of line segments,
+    given as arrays of shape (N, 2, 2) and (M, 2, 2) of segment endpoints.
+    Returns an (N, M) boolean array that is True wherever segment pair (n, m)
+    may intersect. The test is conservative: collinear touches are flagged as
+    potential intersections, so exact contact points should be confirmed with
+    the scalar collision() function.
+    '''
 
-    # If there are intersections, find the intersection points
-    if intersections[0]:
+    edges_a = np.asarray(edges_a, dtype=np.float64)
+    edges_b = np.asarray(edges_b, dtype=np.float64)
 
-        # If there are no colinear points
-        if not intersections[1]:
-            dx = (segment1[0][0] - segment1[1][0], segment2[0][0] - segment2[1][0])
-            dy = (segment1[0][1] - segment1[1][1], segment2[0][1] - segment2[1][1])
-            div = det(dx, dy)
+    # Segment start/end points, broadcast to (N, 1, 2) x (1, M, 2)
+    a1 = edges_a[:, np.newaxis, 0]
+    a2 = edges_a[:, np.newaxis, 1]
+    b1 = edges_b[np.newaxis, :, 0]
+    b2 = edges_b[np.newaxis, :, 1]
 
-            if div != 0:
-                d = (det(*segment1), det(*segment2))
-                x = det(d, dx)/div
-                y = det(d, dy)/div
-                collisions.append((x,y))
+    def cross(v, w):
+        # Z-component of the 2D cross product
+        return v[..., 0] * w[..., 1] - v[..., 1] * w[..., 0]
+
+    # Orientation of each segment's endpoints relative to the other segment
+    d1 = cross(b2 - b1, a1 - b1)
+    d2 = cross(b2 - b1, a2 - b1)
+    d3 = cross(a2 - a1, b1 - a1)
+    d4 = cross(a2 - a1, b2 - a1)
+
+    # Segments intersect when each straddles (or touches) the other's line
+    return (d1 * d2 <= 0) & (d3 * d4 <= 0)
+
+
+@njit(cache=True)
+def _ray_tmin_kernel(ray_starts, ray_ends, segments):
+    '''
+    Scalar-loop version of the ray-vs-segment minimum-t search, keeping all
+    intermediates in registers so numba can compile it without allocating the
+    (R, N) temporaries the broadcast version needs.
+    '''
+
+    num_rays = ray_starts.shape[0]
+    t_min = np.full(num_rays, np.inf)
+
+    for ct_ray in range(num_rays):
+        rx = ray_starts[ct_ray, 0]
+        ry = ray_starts[ct_ray, 1]
+        dx = ray_ends[ct_ray, 0] - rx
+        dy = ray_ends[ct_ray, 1] - ry
+
+        for ct_seg in range(segments.shape[0]):
+            sx = segments[ct_seg, 0]
+            sy = segments[ct_seg, 1]
+            ex = segments[ct_seg, 2] - sx
+            ey = segments[ct_seg, 3] - sy
+
+            denom = dx * ey - dy * ex
+            if denom == 0:
+                continue
+
+            diff_x = sx - rx
+            diff_y = sy - ry
+            t = (diff_x * ey - diff_y * ex) / denom
+            u = (diff_x * dy - diff_y * dx) / denom
+
+            if 0 <= t <= 1 and 0 <= u <= 1 and t < t_min[ct_ray]:
+                t_min[ct_ray] = t
+
+    return t_min
 
-        # If there are colinear points
-        else:
-            for point in intersections[1]:
-                collisions.append(point)
 
-    return collisions
+def ray_segment_tmin(ray_starts, ray_ends, segments):
+    '''
+    Vectorized ray-vs-segment intersection. Takes (R, 2) arrays of ray start
+    and end points and an (N, 4) array of segment endpoints (x1, y1, x2, y2),
+    and returns an (R,) array holding, for each ray, the smallest parametric
+    distance t (0-1 along the ray) to any intersected segment, or np.inf for
+    rays that hit nothing. All (R x N) pairs are solved in one broadcast pass,
+    or in a compiled scalar loop when numba is installed. The input dtype is
+    preserved, so float32 buffers are processed without an upcast copy.
+    '''
+
+    ray_starts = np.asarray(ray_starts)
+    ray_ends = np.asarray(ray_ends)
+    segments = np.asarray(segments)
+
+    if NUMBA_AVAILABLE:
+        return _ray_tmin_kernel(ray_starts, ray_ends, segments)
+
+    # Ray and segment direction vectors
+    d_ray = ray_ends - ray_starts                   # (R, 2)
+    seg_starts = segments[:, 0:2]                   # (N, 2)
+    d_seg = segments[:, 2:4] - seg_starts           # (N, 2)
+
+    # Solve ray_start + t*d_ray == seg_start + u*d_seg for every (ray, segment)
+    # pair via 2D cross products, broadcast to (R, N)
+    denom = (d_ray[:, np.newaxis, 0] * d_seg[np.newaxis, :, 1]
+             - d_ray[:, np.newaxis, 1] * d_seg[np.newaxis, :, 0])
+    diff = seg_starts[np.newaxis, :, :] - ray_starts[:, np.newaxis, :]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (diff[:, :, 0] * d_seg[np.newaxis, :, 1]
+             - diff[:, :, 1] * d_seg[np.newaxis, :, 0]) / denom
+        u = (diff[:, :, 0] * d_ray[:, np.newaxis, 1]
+             - diff[:, :, 1] * d_ray[:, np.newaxis, 0]) / denom
+
+    # Keep only intersections within both the ray and the segment
+    valid = (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+    return np.where(valid, t, np.inf).min(axis=1)
+
+
+def wall_squares_aabb(wall_squares: list):
+    '''
+    Builds a list of axis-aligned bounding boxes, in (min_x, min_y, max_x, max_y)
+    format, for a list of wall squares. Walls are static, so this only needs to
+    be calculated once at maze load.
+    '''
+
+    aabbs = []
+    for square in wall_squares:
+        xs = [point[0] for segment in square for point in segment]
+        ys = [point[1] for segment in square for point in segment]
+        aabbs.append((min(xs), min(ys), max(xs), max(ys)))
+
+    return aabbs
 
 
 def closest(start: list, test_pts: list):
@@ -180,8 +344,9 @@ def simulate_sensors(environment, sensors):
 
     ROBOT = environment.get("ROBOT", None)
     for d_id in sensors:
-        if d_id in ROBOT.sensors:
-            ROBOT.sensors[d_id].simulate(0, environment)
+        sensor = ROBOT.sensors.get(d_id)
+        if sensor is not None:
+            sensor.simulate(0, environment)
 
 
 def angle(segment1:list, segment2:list):
@@ -413,6 +578,10 @@ def remove_duplicates(sorted_list:list)->list:
 def in_block(vec):
     '''determins whether a vector is inside a wall block or not'''
 
+    # Imported here rather than at module top: config constructs the devices
+    # at import time, and the devices use this module during construction
+    import config as CONFIG
+
     x_idx = int(vec.x//CONFIG.wall_segment_length)
     y_idx = int(vec.y//CONFIG.wall_segment_length)
 